@@ -18,11 +18,20 @@ class ChannelSequencer(Module):
     `m_start`/`m_stop` specify the values of the given counter signal `m` (assumed to be
     monotonically increasing) between which the output is active. `clear` deasserts the
     output irrespective of the configured times.
+
+    `ce` (default: enabled) is a clock enable for all the synchronous logic; it can be
+    deasserted to stop the comparators toggling while the core is idle.
+
+    `m_advancing` (default: asserted) must be deasserted in cycles where `m` is held
+    rather than incremented, so the registered lookahead comparators do not pre-arm
+    against a value `m` is not about to take.
     """
     def __init__(self, m):
         self.m_start = Signal(counter_width)
         self.m_stop = Signal(counter_width)
         self.clear = Signal()
+        self.ce = Signal(reset=1)
+        self.m_advancing = Signal(reset=1)
 
         self.output = Signal()
 
@@ -31,20 +40,31 @@ class ChannelSequencer(Module):
         self.stb_start = Signal()
         self.stb_stop = Signal()
 
-        self.comb += [
-            self.stb_start.eq(m == self.m_start),
-            self.stb_stop.eq(m == self.m_stop)
-        ]
+        # Lookahead comparators: compare against the value m takes next cycle,
+        # so the strobes come out of a register but assert in the same cycle
+        # as the previous combinational m == m_start/m_stop comparisons.
+        # Qualified with m_advancing (and clear), because the lookahead only
+        # describes the next value of m in cycles where m actually increments:
+        # a counter held at 0 with m_start == 1 must not pre-arm the strobe.
+        self.sync += If(self.ce,
+            self.stb_start.eq(~self.clear & self.m_advancing
+                              & ((m + 1) == self.m_start)),
+            self.stb_stop.eq(~self.clear & self.m_advancing
+                             & ((m + 1) == self.m_stop))
+        )
 
-        self.sync += [
-            If(self.stb_start,
+        # Single priority mux into the output flop (clear wins, then start
+        # over stop), rather than a separate clear override cascaded after the
+        # start/stop mux.
+        self.sync += If(self.ce,
+            If(self.clear,
+                self.output.eq(0)
+            ).Elif(self.stb_start,
                 self.output.eq(1)
-            ).Else(
-                If(self.stb_stop,
-                    self.output.eq(0))
-            ),
-            If(self.clear, self.output.eq(0))
-        ]
+            ).Elif(self.stb_stop,
+                self.output.eq(0)
+            )
+        )
 
 
 class InputGater(Module):
@@ -59,11 +79,21 @@ class InputGater(Module):
     Clear has to be asserted to clear the reference edge and the triggered flag.
 
     The start gate offset must be at least 8mu.
+
+    `ce` (default: enabled) is a clock enable for the capture registers
+    (`triggered`/`sig_ts`); it can be deasserted while the core is idle, which also
+    preserves the captured results for readback between runs. The reference/window
+    path is deliberately not gated: it must keep tracking events so that a signal
+    strobe in the first enabled cycle is never evaluated against a stale window.
     """
     def __init__(self, m, phy_ref, phy_sig):
         self.clear = Signal()
+        self.ce = Signal(reset=1)
 
         self.triggered = Signal()
+        # triggered feeds the heralder plus every event counter; let the tools
+        # replicate the flop rather than routing one net to all of them.
+        self.triggered.attr.add(("MAX_FANOUT", "8"))
 
         n_fine = len(phy_ref.fine_ts)
 
@@ -78,44 +108,91 @@ class InputGater(Module):
 
         self.got_ref = Signal()
 
-        # Absolute gate times, calculated when we get the reference event
+        # Absolute gate start and window length, calculated when we get the
+        # reference event
         abs_gate_start = Signal(counter_width+n_fine)
-        abs_gate_stop = Signal(counter_width+n_fine)
+        gate_width = Signal(counter_width+n_fine)
 
+        # The timestamp assemblies are registered and the phy strobes delayed
+        # by one cycle to match, so the adder/comparators see locally
+        # registered copies of the shared counter instead of loading its
+        # high-fanout net directly. Reference and signal paths shift equally,
+        # leaving relative gate timing and the captured values unchanged.
         t_ref = Signal(counter_width+n_fine)
-        self.comb += t_ref.eq(Cat(phy_ref.fine_ts,m))
+        stb_ref_d = Signal()
+        self.sync += [
+            t_ref.eq(Cat(phy_ref.fine_ts,m)),
+            stb_ref_d.eq(phy_ref.stb_rising)
+        ]
 
+        # The window width only depends on the (static) gate configuration, so
+        # it is registered continuously rather than under the reference-event
+        # strobe; arming on a reference event is then a single adder.
+        self.sync += gate_width.eq(self.gate_stop - self.gate_start)
+
+        # got_ref as a single set/hold/clear expression (clear wins, as
+        # before) so it maps onto one flop with a one-level input function
+        # instead of a cascaded set-then-clear mux pair.
         self.sync += [
-            If(phy_ref.stb_rising,
-                self.got_ref.eq(1),
+            self.got_ref.eq((self.got_ref | stb_ref_d) & ~self.clear),
+            If(stb_ref_d,
                 self.ref_ts.eq(t_ref),
-                abs_gate_start.eq(self.gate_start + t_ref),
-                abs_gate_stop.eq(self.gate_stop + t_ref)
-            ),
-            If(self.clear,
-                self.got_ref.eq(0),
-                self.triggered.eq(0)
+                abs_gate_start.eq(self.gate_start + t_ref)
             )
         ]
 
-        past_window_start = Signal()
-        before_window_end = Signal()
+        # Range test as a single subtract-and-compare: an event before the
+        # window start wraps around to a large offset and fails the width
+        # comparison, so one comparator replaces the previous >= start/
+        # <= stop pair. Assumes gate_stop >= gate_start.
+        t_since_start = Signal(counter_width+n_fine)
         triggering = Signal()
         t_sig = Signal(counter_width+n_fine)
-        self.comb += [
+        stb_sig_d = Signal()
+        self.sync += [
             t_sig.eq(Cat(phy_sig.fine_ts,m)),
-            past_window_start.eq(t_sig >= abs_gate_start),
-            before_window_end.eq(t_sig <= abs_gate_stop),
-            triggering.eq(past_window_start & before_window_end)
+            stb_sig_d.eq(phy_sig.stb_rising)
         ]
-
-        self.sync += [
-            If(phy_sig.stb_rising & ~self.triggered & triggering,
-                self.triggered.eq(triggering),
-                self.sig_ts.eq(t_sig)
-            )
+        self.comb += [
+            t_since_start.eq(t_sig - abs_gate_start),
+            triggering.eq(t_since_start <= gate_width)
         ]
 
+        # Single capture enable shared by the triggered flag and the timestamp
+        # register, so the strobe/window/not-yet-triggered product is one net
+        # feeding two flop enables rather than being recomputed per register.
+        # Gated with clear so that an event strobed in the last cycle of an
+        # entanglement attempt cannot leak into the next one through the
+        # delayed strobe.
+        capture_en = Signal()
+        self.comb += capture_en.eq(
+            stb_sig_d & ~self.clear & ~self.triggered & triggering)
+
+        # Same set/hold/clear form for triggered (capture_en already includes
+        # ~clear, so the priorities are unchanged).
+        self.sync += If(self.ce,
+            self.triggered.eq((self.triggered | capture_en) & ~self.clear),
+            If(capture_en, self.sig_ts.eq(t_sig))
+        )
+
+
+class InputGaterBank(Module):
+    """Bank of `InputGater`s sharing a single reference phy.
+
+    The individual `triggered` flags are collected into one vector signal, so
+    consumers (heralder, event counters) connect to a single wide signal
+    rather than per-bit concatenations of submodule outputs.
+    """
+    def __init__(self, m, phy_ref, phy_sigs):
+        self.gaters = [InputGater(m, phy_ref, phy_sig) for phy_sig in phy_sigs]
+        self.submodules += self.gaters
+
+        self.triggered = Signal(len(self.gaters))
+
+        # # #
+
+        self.comb += self.triggered.eq(Cat(*(g.triggered for g in self.gaters)))
+
 
 class Heralder(Module):
     """Asserts 'herald' if input vector matches any pattern in patterns"""
@@ -130,7 +207,18 @@ class Heralder(Module):
         # # #
 
         self.comb += [self.matches[i].eq(p==self.sig) for i, p in enumerate(self.patterns)]
-        self.comb += self.herald.eq( self.pattern_ens & self.matches != 0 )
+
+        # Fold each pattern match with its enable bit into a single product
+        # term and reduce-OR the terms, rather than masking the whole match
+        # vector and comparing against zero; compare-plus-enable then fits a
+        # single LUT per pattern. matches itself stays unmasked, as it is read
+        # back by the RTIO interface.
+        enabled_matches = Signal(n_patterns)
+        self.comb += [enabled_matches[i].eq(self.pattern_ens[i] & self.matches[i])
+                      for i in range(n_patterns)]
+        self.comb += self.herald.eq(
+            reduce(lambda a, b: a | b,
+                   [enabled_matches[i] for i in range(n_patterns)]))
 
 
 class CounterBase(Module):
@@ -141,16 +229,16 @@ class CounterBase(Module):
         self.reset = Signal()
         self._match = Signal()
 
-        self.sync += [
-            If(self.read_stb,
-                If(self._match,
-                    self.counter.eq(self.counter + 1)
-                )
-            ),
-            If(self.reset,
-                self.counter.eq(0)
-            )
-        ]
+        # Single sync-reset/clock-enable accumulator (reset has priority, as
+        # before), the form the tools can pack into a DSP accumulator; the
+        # attribute makes the intent explicit, keeping the wide adders out of
+        # the LUT fabric.
+        self.counter.attr.add(("USE_DSP", "YES"))
+        self.sync += If(self.reset,
+            self.counter.eq(0)
+        ).Elif(self.read_stb & self._match,
+            self.counter.eq(self.counter + 1)
+        )
 
 
 class SingleChannelCounter(CounterBase):
@@ -162,18 +250,72 @@ class SingleChannelCounter(CounterBase):
 
 class PatternCounter(CounterBase):
     """Counts events where the overall pattern matches at least one of a number of
-    given ones."""
+    given ones.
+
+    Matching is done against a one-hot decode of the signal vector
+    (`sig_decoded`, shared between all counters by the parent), masked with the
+    union of the decoded patterns. The pattern decoders only see the static
+    configuration registers, so per event a single AND/OR tree replaces one
+    equality comparator per pattern.
+    """
     def __init__(self, n_sig, num_patterns, counter_width):
         super().__init__(n_sig, counter_width)
+        self.sig_decoded = Signal(2**n_sig)
         self.patterns = [Signal(n_sig) for _ in range(num_patterns)]
-        self.comb += self._match.eq(
-            reduce(lambda a, b: a | b, (self.sig == p for p in self.patterns)))
+
+        pattern_mask = Signal(2**n_sig)
+        self.sync += pattern_mask.eq(
+            reduce(lambda a, b: a | b, (1 << p for p in self.patterns)))
+        self.comb += self._match.eq((self.sig_decoded & pattern_mask) != 0)
+
+
+class TimeoutCountdown(Module):
+    """Loadable down-counter for the run timeout.
+
+    The counter is (re)loaded from `load_value` on `load_stb` and otherwise
+    decrements every cycle until it reaches zero, at which point `expired` is
+    asserted and the counter holds. `freeze` pauses the decrement, e.g. when
+    an external stop condition has already been reached.
+    """
+    def __init__(self, width):
+        self.load_stb = Signal()
+        self.load_value = Signal(width)
+        self.freeze = Signal()
+
+        self.value = Signal(width)
+        self.expired = Signal()
+
+        # # #
+
+        # The stored count runs one below the loaded value, with an extra sign
+        # bit: expiry is then just the borrow into the sign bit instead of a
+        # wide zero-comparator. The readback value compensates by adding one,
+        # which also wraps the expired -1 back to 0, so externally the counter
+        # behaves exactly like a plain load/decrement/stop-at-zero counter.
+        counter = Signal(width + 1)
+        self.comb += [
+            self.expired.eq(counter[-1]),
+            self.value.eq(counter[:width] + 1)
+        ]
+        self.sync += If(self.load_stb,
+            counter.eq(self.load_value - 1)
+        ).Elif(~self.expired & ~self.freeze,
+            counter.eq(counter - 1)
+        )
 
 
 class MainStateMachine(Module):
     def __init__(self, time_cursor_width=10, event_counter_width=14):
         self.m = Signal(time_cursor_width) # Global cycle-relative time.
-        self.time_remaining = Signal(32) # Clock cycles remaining before timeout
+        # m fans out to every sequencer comparator and the RTIO readback; let
+        # the tools replicate the register near its consumer clusters instead
+        # of routing one net across the die.
+        self.m.attr.add(("MAX_FANOUT", "16"))
+
+        # Clock cycles remaining before timeout, kept in a dedicated countdown
+        # subcell so the decrementer maps to a single clean carry chain.
+        self.submodules.countdown = TimeoutCountdown(32)
+        self.time_remaining = self.countdown.value
         self.time_remaining_buf = Signal(32)
 
         #: How many iterations of the loop have completed since last start
@@ -213,18 +355,33 @@ class MainStateMachine(Module):
 
         self.cycle_ending = Signal()
 
-        # # #
+        # Asserted while m is advancing (i.e. in the main counter state); m is held
+        # at zero in all other states.
+        self.counting = Signal()
 
-        self.comb += self.cycle_ending.eq(self.m == self.m_end)
+        # # #
 
         self.trigger_in = Signal()
         self.success_in = Signal()
         self.slave_ready = Signal()
         self.timeout_in = Signal()
+        # The slave-ready handshake only delays the start of a run, so it gets
+        # a full two-flop synchronizer against metastability on the core link
+        # input. The trigger/success/timeout broadcasts keep a single input
+        # register, as their latency is part of the master/slave cycle
+        # alignment (the partner's RTIO clock is syntonized to ours).
+        slave_ready_1 = Signal()
+        # Mark the synchronizer flops so the tools keep them adjacent and
+        # exclude them from IOB packing; the IOB-to-flop route is then the
+        # async input's settling budget, not a reported timing path.
+        for s in (slave_ready_1, self.slave_ready):
+            s.attr.add(("ASYNC_REG", "TRUE"))
+            s.attr.add(("IOB", "FALSE"))
         self.sync += [
             self.trigger_in.eq(self.trigger_in_raw),
             self.success_in.eq(self.success_in_raw),
-            self.slave_ready.eq(self.slave_ready_raw),
+            slave_ready_1.eq(self.slave_ready_raw),
+            self.slave_ready.eq(slave_ready_1),
             self.timeout_in.eq(self.timeout_in_raw)
         ]
 
@@ -234,78 +391,133 @@ class MainStateMachine(Module):
         ]
 
 
-        # The core times out if time_remaining countdown reaches zero, or,
+        # The core times out if the time_remaining countdown expires, or,
         # if we are a slave, if the master has timed out.
         # This is required to ensure the slave syncs with the master
-        self.comb += self.timeout.eq( (self.time_remaining == 0)
+        self.comb += [
+            self.countdown.load_stb.eq(self.run_stb),
+            self.countdown.load_value.eq(self.time_remaining_buf),
+            self.countdown.freeze.eq(~self.act_as_master & self.timeout_in),
+            self.timeout.eq(self.countdown.expired
                             | (~self.act_as_master & self.timeout_in))
-
-        self.sync += [
-            If(self.run_stb,
-                self.time_remaining.eq(self.time_remaining_buf)
-            ).Else(
-                If(~self.timeout,
-                    self.time_remaining.eq(self.time_remaining-1)))
         ]
 
-        done = Signal()
-        done_d = Signal()
         finishing = Signal()
         self.comb += finishing.eq( ~self.run_stb & self.running & (self.timeout | self.success))
-        # Done asserted at the at the end of the successful / timedout cycle
-        self.comb += done.eq(finishing & self.cycle_starting)
-        self.comb += self.done_stb.eq(done & ~done_d)
+        # Done asserted at the at the end of the successful / timedout cycle.
+        # done_stb clears running on the next edge, which deasserts finishing,
+        # so this is a single-cycle pulse by construction and needs no edge
+        # detector.
+        self.comb += self.done_stb.eq(finishing & self.cycle_starting)
+
+
+        # Main state machine, one-hot encoded (Migen's FSM only generates
+        # binary encodings). Each state test is then a single register bit
+        # rather than a decode of the encoded state register, keeping the
+        # next-state and output logic shallow.
+        (STATE_IDLE, STATE_TRIGGER_SLAVE, STATE_COUNTER,
+         STATE_SLAVE_SUCCESS_WAIT, STATE_SLAVE_SUCCESS_CHECK) = range(5)
+
+        state = Signal(5, reset=1 << STATE_IDLE)
+        next_state = Signal(5)
+        self.sync += state.eq(next_state)
+
+        self.comb += self.counting.eq(state[STATE_COUNTER])
+
+        # Cycle count within TRIGGER_SLAVE; the trigger to the slave is held
+        # for two cycles from a single state rather than two chained states.
+        trigger_cnt = Signal()
+
+        # Leave IDLE once a run has started and (on the master) the slave is
+        # ready, or (on the slave) the master has sent the trigger.
+        idle_advance = Signal()
+        self.comb += idle_advance.eq(
+            ~finishing & self.ready & Mux(self.act_as_master,
+                                          self.slave_ready | self.standalone,
+                                          self.trigger_in))
 
-        # Ready asserted when run_stb is pulsed, and cleared on success or timeout
+        self.comb += [
+            next_state[STATE_IDLE].eq(
+                (state[STATE_IDLE] & ~idle_advance)
+                | (state[STATE_COUNTER] & self.cycle_ending & self.act_as_master)
+                | state[STATE_SLAVE_SUCCESS_CHECK]),
+            next_state[STATE_TRIGGER_SLAVE].eq(
+                (state[STATE_IDLE] & idle_advance & self.act_as_master)
+                | (state[STATE_TRIGGER_SLAVE] & ~trigger_cnt)),
+            next_state[STATE_COUNTER].eq(
+                (state[STATE_IDLE] & idle_advance & ~self.act_as_master)
+                | (state[STATE_TRIGGER_SLAVE] & trigger_cnt)
+                | (state[STATE_COUNTER] & ~self.cycle_ending)),
+            next_state[STATE_SLAVE_SUCCESS_WAIT].eq(
+                state[STATE_COUNTER] & self.cycle_ending & ~self.act_as_master),
+            next_state[STATE_SLAVE_SUCCESS_CHECK].eq(
+                state[STATE_SLAVE_SUCCESS_WAIT]),
+        ]
+
+        # Down-counting twin of m: loaded with m_end while idle and
+        # decremented alongside m, so detecting the end of the cycle is a
+        # compare-to-constant zero test instead of the wide m == m_end
+        # equality. The flag is still pre-computed a cycle ahead (from the
+        # value m_left is about to take), so the COUNTER state branches on a
+        # registered bit and no observable latency is added.
+        m_left = Signal(time_cursor_width)
         self.sync += [
-            If(self.run_stb,
-                self.ready.eq(1),
-                self.cycles_completed.eq(0),
-                self.success.eq(0)),
-            done_d.eq(done),
-            If(finishing, self.ready.eq(0))
+            If(state[STATE_IDLE], m_left.eq(self.m_end)),
+            If(state[STATE_COUNTER], m_left.eq(m_left - 1))
         ]
+        self.sync += self.cycle_ending.eq(
+            Mux(state[STATE_IDLE], self.m_end == 0,
+                Mux(state[STATE_COUNTER], m_left == 1, m_left == 0)))
+
+        # cycle_starting mirrors the IDLE state bit from its own flop (same
+        # waveform, as next_state becomes state on the same edge). The eight
+        # gater/sequencer clears and the done logic then load a dedicated
+        # register instead of piling onto the FSM's state bit, and the tools
+        # may replicate it further.
+        self.cycle_starting.attr.add(("MAX_FANOUT", "8"))
+        self.sync += self.cycle_starting.eq(next_state[STATE_IDLE])
+
+        # Drive the slave trigger from a dedicated register (computed from the
+        # upcoming state, so the waveform is identical to decoding the current
+        # state combinationally). A clean flop output can be packed into the
+        # IOB driving the core link.
+        self.sync += self.trigger_out.eq(next_state[STATE_TRIGGER_SLAVE])
 
-        fsm = FSM()
-        self.submodules += fsm
+        self.sync += [
+            If(state[STATE_IDLE],
+                self.m.eq(0),
+                trigger_cnt.eq(0)
+            ),
+            If(state[STATE_TRIGGER_SLAVE], trigger_cnt.eq(trigger_cnt + 1)),
+            If(state[STATE_COUNTER], self.m.eq(self.m + 1))
+        ]
 
-        fsm.act("IDLE",
-            self.cycle_starting.eq(1),
-            If(self.act_as_master,
-                If(~finishing & self.ready & (self.slave_ready | self.standalone), NextState("TRIGGER_SLAVE"))
-            ).Else(
-                If(~finishing & self.ready & self.trigger_in, NextState("COUNTER"))
+        # One load/update mux per status register, with the run_stb reset as
+        # the highest-priority arm: each flop gets a single D-input mux, and a
+        # run starting in the same cycle as a state machine event can no
+        # longer carry stale success/ready state into the new run. Ready is
+        # asserted when run_stb is pulsed and cleared on success or timeout;
+        # success is latched from the herald on the master, or from the
+        # master's broadcast (in SLAVE_SUCCESS_CHECK) on the slave.
+        self.sync += [
+            If(self.run_stb,
+                self.ready.eq(1)
+            ).Elif(finishing,
+                self.ready.eq(0)
             ),
-            NextValue(self.m, 0),
-            self.trigger_out.eq(0)
-        )
-        fsm.act("TRIGGER_SLAVE",
-            NextState("TRIGGER_SLAVE2"),
-            self.trigger_out.eq(1)
-        )
-        fsm.act("TRIGGER_SLAVE2",
-            NextState("COUNTER"),
-            self.trigger_out.eq(1)
-        )
-        fsm.act("COUNTER",
-            NextValue(self.m, self.m + 1),
-            If(self.cycle_ending,
-                NextValue(self.cycles_completed, self.cycles_completed+1),
-                If(self.act_as_master,
-                    If(self.herald, NextValue(self.success, 1)),
-                    NextState("IDLE")
-                ).Else(
-                    NextState("SLAVE_SUCCESS_WAIT")
-                )
+            If(self.run_stb,
+                self.cycles_completed.eq(0)
+            ).Elif(state[STATE_COUNTER] & self.cycle_ending,
+                self.cycles_completed.eq(self.cycles_completed + 1)
             ),
-            self.trigger_out.eq(0)
-        )
-        fsm.act("SLAVE_SUCCESS_WAIT",
-            NextState("SLAVE_SUCCESS_CHECK"))
-        fsm.act("SLAVE_SUCCESS_CHECK", # On slave, checking if master broadcast success
-            If(self.success_in, NextValue(self.success, 1)),
-            NextState("IDLE")
-        )
+            If(self.run_stb,
+                self.success.eq(0)
+            ).Elif((state[STATE_COUNTER] & self.cycle_ending
+                    & self.act_as_master & self.herald)
+                   | (state[STATE_SLAVE_SUCCESS_CHECK] & self.success_in),
+                self.success.eq(1)
+            )
+        ]
 
 
 class EntanglerCore(Module):
@@ -326,8 +538,9 @@ class EntanglerCore(Module):
 
         self.submodules.sequencers = [ChannelSequencer(self.msm.m) for _ in range(4)]
 
-        self.submodules.apd_gaters = [InputGater(self.msm.m, phy_422pulse, phy_apd)
-                                      for phy_apd in phy_apds]
+        self.submodules.apd_bank = InputGaterBank(self.msm.m, phy_422pulse,
+                                                  phy_apds)
+        self.apd_gaters = self.apd_bank.gaters
         n_sig = len(self.apd_gaters)
 
         self.submodules.heralder = Heralder(n_sig=n_sig, n_patterns=4)
@@ -360,13 +573,26 @@ class EntanglerCore(Module):
             for i, (sequencer, pad, passthrough_sig) in enumerate(
                     zip(self.sequencers, output_pads, passthrough_sigs)):
                 if i == SEQUENCER_IDX_422ps:
-                    local_422ps_out = Mux(self.enable,
-                                          sequencer.output, passthrough_sig)
+                    # Register the slave's copy of the 422ps output before the
+                    # core link buffer as well; one more cycle on the
+                    # calibration-only passthrough path is irrelevant, and the
+                    # link IOB gets a clean flop like the pad outputs below.
+                    self.sync += local_422ps_out.eq(Mux(self.enable,
+                                                        sequencer.output,
+                                                        passthrough_sig))
                     passthrough_sig = (passthrough_sig |
                                        (slave_422ps_raw & self.msm.is_master))
+                # Register the enable mux into a dedicated flop that the tools
+                # can pack into the IOB, so only clock-to-out remains on the
+                # pad path. This delays sequencer and passthrough outputs
+                # alike by one coarse cycle, a constant offset absorbed by the
+                # usual output timing calibration.
+                obuf_d = Signal()
+                obuf_d.attr.add(("IOB", "TRUE"))
+                self.sync += obuf_d.eq(Mux(self.enable,
+                                           sequencer.output, passthrough_sig))
                 self.specials += Instance("OBUFDS",
-                                          i_I=Mux(self.enable,
-                                                  sequencer.output, passthrough_sig),
+                                          i_I=obuf_d,
                                           o_O=pad.p,
                                           o_OB=pad.n)
 
@@ -393,28 +619,50 @@ class EntanglerCore(Module):
 
             # Interface between master and slave core.
 
+            # Link-buffer direction enables, computed once and registered
+            # rather than recomputing the and-not terms at each pad.
+            # is_master/standalone are static configuration, so the extra
+            # cycle is irrelevant, and the placer can replicate the flops
+            # towards the IO ring instead of routing combinational products
+            # across the die.
+            slave_mode = Signal()
+            not_master = Signal()
+            master_mode = Signal()
+            self.sync += [
+                slave_mode.eq(~self.msm.is_master & ~self.msm.standalone),
+                not_master.eq(~self.msm.is_master),
+                master_mode.eq(self.msm.is_master)
+            ]
+
             # Slave -> master:
             ts_buf(core_link_pads[0],
                 self.msm.ready, self.msm.slave_ready_raw,
-                ~self.msm.is_master & ~self.msm.standalone)
+                slave_mode)
 
             ts_buf(core_link_pads[4],
                 local_422ps_out, slave_422ps_raw,
-                ~self.msm.is_master)
+                not_master)
 
             # Master -> slave:
             ts_buf(core_link_pads[1],
                 self.msm.trigger_out, self.msm.trigger_in_raw,
-                self.msm.is_master)
+                master_mode)
             ts_buf(core_link_pads[2],
                 self.msm.success, self.msm.success_in_raw,
-                self.msm.is_master)
+                master_mode)
+            # msm.timeout is combinational (countdown comparator); register it
+            # so the link IOB is driven from a dedicated flop like the other
+            # master -> slave signals. The slave only sees the master's
+            # timeout a cycle later, which merely lets it idle one more cycle
+            # before stopping.
+            timeout_r = Signal()
+            self.sync += timeout_r.eq(self.msm.timeout)
             ts_buf(core_link_pads[3],
-                self.msm.timeout, self.msm.timeout_in_raw,
-                self.msm.is_master)
+                timeout_r, self.msm.timeout_in_raw,
+                master_mode)
 
         # Connect heralder inputs.
-        self.comb += self.heralder.sig.eq(Cat(*(g.triggered for g in self.apd_gaters)))
+        self.comb += self.heralder.sig.eq(self.apd_bank.triggered)
 
         # Clear gater and sequencer state at start of each cycle
         self.comb += [gater.clear.eq(self.msm.cycle_starting)
@@ -422,25 +670,64 @@ class EntanglerCore(Module):
         self.comb += [sequencer.clear.eq(self.msm.cycle_starting)
                             for sequencer in self.sequencers]
 
+        # The sequencer lookahead comparators are only meaningful while m is
+        # advancing; in particular m is held at zero (with clear deasserted)
+        # during the slave-trigger states, where m_start == 1 must not pre-arm.
+        self.comb += [sequencer.m_advancing.eq(self.msm.counting)
+                            for sequencer in self.sequencers]
+
+        # Stop the gater capture and sequencer output registers toggling while
+        # the core is not running, to save dynamic power during the (typically
+        # long) waits between entanglement attempts. running asserts while the
+        # state machine is still idling, so the clear on cycle start is applied
+        # (with the clock enabled) before the first entanglement cycle and no
+        # stale state survives into the next run.
+        self.comb += [gater.ce.eq(self.msm.running)
+                            for gater in self.apd_gaters]
+        self.comb += [sequencer.ce.eq(self.msm.running)
+                            for sequencer in self.sequencers]
+
         self.comb += self.msm.herald.eq(self.heralder.herald)
 
         # 422ps trigger event counter. We use got_ref from the first gater for
-        # convenience (any other channel would work just as well).
+        # convenience (any other channel would work just as well). Counting
+        # the rising edge of got_ref (it is cleared at every cycle start, so
+        # there is at most one edge per cycle) keeps the wide cycle_ending
+        # comparator off the counter enable.
         self.triggers_received = Signal(event_counter_width)
+        got_ref_d = Signal()
         self.sync += [
+            got_ref_d.eq(self.apd_gaters[0].got_ref),
             If(self.msm.run_stb,
                 self.triggers_received.eq(0)
             ).Else(
-                If(self.msm.cycle_ending & self.apd_gaters[0].got_ref,
+                If(self.apd_gaters[0].got_ref & ~got_ref_d,
                     self.triggers_received.eq(self.triggers_received+1)
                 )
             )
         ]
 
-        # Connect up event counters.
+        # Connect up event counters. The one-hot decode of the signal vector
+        # is computed once here and shared by all the pattern counters.
+        sig_decoded = Signal(2**n_sig)
+        self.comb += sig_decoded.eq(1 << self.apd_bank.triggered)
+
+        # Local copies of the counter strobes: cycle_ending/run_stb otherwise
+        # fan out to the enables of eight 32-bit counter banks on top of their
+        # state machine consumers. The one-cycle shift is invisible: the
+        # triggered flags are only cleared on the next cycle start, and the
+        # counters are read out long after a run completes.
+        counter_read_stb = Signal()
+        counter_reset = Signal()
+        self.sync += [
+            counter_read_stb.eq(self.msm.cycle_ending),
+            counter_reset.eq(self.msm.run_stb)
+        ]
         for c in self.counters:
             self.comb += [
                 c.sig.eq(self.heralder.sig),
-                c.reset.eq(self.msm.run_stb),
-                c.read_stb.eq(self.msm.cycle_ending),
+                c.reset.eq(counter_reset),
+                c.read_stb.eq(counter_read_stb),
             ]
+        for c in self.pattern_counters:
+            self.comb += c.sig_decoded.eq(sig_decoded)
@@ -51,14 +51,40 @@ ADDR_R_COUNTER_RESULT_BASE = 0b110000
 
 @portable
 def patterns_to_reg(patterns: TList(TInt32)) -> TInt32:
+    # Unrolled per slot so the core device compiler emits straight-line
+    # shifts/ORs instead of a loop with an induction variable.
+    n = len(patterns)
+    assert n <= 4
     data = 0
-    assert len(patterns) <= 4
-    for i in range(len(patterns)):
-        data |= (patterns[i] & 0xf) << (4 * i)
-        data |= 1 << (16 + i)
+    if n > 0:
+        data |= (patterns[0] & 0xf) | (1 << 16)
+    if n > 1:
+        data |= ((patterns[1] & 0xf) << 4) | (1 << 17)
+    if n > 2:
+        data |= ((patterns[2] & 0xf) << 8) | (1 << 18)
+    if n > 3:
+        data |= ((patterns[3] & 0xf) << 12) | (1 << 19)
     return data
 
 
+@portable
+def _encode_counter_patterns(patterns: TList(TInt32)) -> TInt32:
+    """Pad a pattern list to four slots and pack the register word.
+
+    Leftover slots are filled with the first element, which effectively
+    ignores them; all four slot-valid bits are therefore always set. The
+    padding is folded into the slot selection, so no intermediate list is
+    allocated.
+    """
+    n = len(patterns)
+    p0 = patterns[0]
+    p1 = patterns[1] if n > 1 else p0
+    p2 = patterns[2] if n > 2 else p0
+    p3 = patterns[3] if n > 3 else p0
+    return ((p0 & 0xf) | ((p1 & 0xf) << 4) | ((p2 & 0xf) << 8)
+            | ((p3 & 0xf) << 12) | (0xf << 16))
+
+
 class Entangler:
     """Sequences remote entanglement experiments between a master and a slave
 
@@ -66,12 +92,22 @@ class Entangler:
     :param is_master: Is this Kasli the sequencer master or the slave
     :param core_device: Core device name
     """
+    kernel_invariants = {"core", "channel", "is_master", "ref_period_mu",
+                         "_channel_base", "_coarse_shift"}
+
     def __init__(self, dmgr, channel, is_master=True, core_device="core"):
         self.core = dmgr.get(core_device)
         self.channel = channel
         self.is_master = is_master
         self.ref_period_mu = self.core.seconds_to_mu(
             self.core.coarse_ref_period)
+        # Precomputed RTIO target base; invariant, so address computations in
+        # the kernels reduce to OR-ing with a constant.
+        self._channel_base = channel << 8
+        # Fine-to-coarse timestamp shift, derived from the core's reference
+        # multiplier (a power of two) rather than hard-coding 8x.
+        assert self.core.ref_multiplier & (self.core.ref_multiplier - 1) == 0
+        self._coarse_shift = self.core.ref_multiplier.bit_length() - 1
 
     @kernel
     def init(self):
@@ -86,9 +122,25 @@ class Entangler:
         :param addr: parameter address.
         :param value: Data to be written.
         """
-        rtio_output((self.channel << 8) | addr, value)
+        rtio_output(self._channel_base | addr, value)
         delay_mu(self.ref_period_mu)
 
+    @kernel
+    def write_many(self, addrs, values):
+        """Write several parameters back-to-back.
+
+        All events are submitted from a single kernel loop, so a full
+        reconfiguration costs one coarse RTIO cycle per word rather than a
+        method call round-trip each. The timeline advances by one coarse RTIO
+        cycle per parameter.
+
+        :param addrs: list of parameter addresses.
+        :param values: list of data words, same length as ``addrs``.
+        """
+        for i in range(len(addrs)):
+            rtio_output(self._channel_base | addrs[i], values[i])
+            delay_mu(self.ref_period_mu)
+
     @kernel
     def read(self, addr):
         """Read parameter
@@ -97,9 +149,30 @@ class Entangler:
 
         :param addr: Memory location address.
         """
-        rtio_output((self.channel << 8) | addr, 0)
+        rtio_output(self._channel_base | addr, 0)
         return rtio_input_data(self.channel)
 
+    @kernel
+    def read_many(self, addrs, results):
+        """Read several parameters with one request burst.
+
+        All read requests are emitted first and the replies drained
+        afterwards, so the input FIFO round-trip is paid once for the whole
+        burst rather than per parameter. The results are written into the
+        caller-provided list, which must have the same length as ``addrs``.
+
+        This method advances the timeline by one coarse RTIO cycle per
+        address and consumes all slack.
+
+        :param addrs: list of parameter addresses.
+        :param results: list the read values are stored into.
+        """
+        for i in range(len(addrs)):
+            rtio_output(self._channel_base | addrs[i], 0)
+            delay_mu(self.ref_period_mu)
+        for i in range(len(addrs)):
+            results[i] = rtio_input_data(self.channel)
+
     @kernel
     def set_config(self, enable=False, standalone=False):
         """Configure the core
@@ -136,9 +209,48 @@ class Entangler:
         length. If the start is after the cycle length there is no pulse.
         """
         if channel < gate_apd0:
-            t_start_mu = t_start_mu >> 3
-            t_stop_mu = t_stop_mu >> 3
+            self.set_output_timing_mu(channel, t_start_mu, t_stop_mu)
+        else:
+            self.set_gate_timing_mu(channel, t_start_mu, t_stop_mu)
+
+    @kernel
+    def set_output_timing_mu(self, channel, t_start_mu, t_stop_mu):
+        """Set the timing for an output (sequencer) channel.
+
+        Fast path of set_timing_mu() for callers that know the channel kind:
+        skips the per-call channel classification, always converting to the
+        coarse clock. See set_timing_mu() for the timing semantics.
+        """
+        self._write_timing_mu(channel, t_start_mu >> self._coarse_shift,
+                              t_stop_mu >> self._coarse_shift)
+
+    @kernel
+    def set_gate_timing_mu(self, channel, t_start_mu, t_stop_mu):
+        """Set the timing for a gate (input) channel.
+
+        Fast path of set_timing_mu() for callers that know the channel kind;
+        gate times keep the fine (1ns) resolution. See set_timing_mu() for
+        the timing semantics.
+        """
+        self._write_timing_mu(channel, t_start_mu, t_stop_mu)
+
+    @kernel
+    def set_timing_bulk_mu(self, channels, t_starts_mu, t_stops_mu):
+        """Set the timing for several channels from one kernel call.
+
+        Parallel-list form of set_timing_mu(); the timing words go out
+        back-to-back, one coarse RTIO cycle apart. Should the gateware grow a
+        burst-write address, only this method needs updating.
+
+        :param channels: list of timing channel addresses.
+        :param t_starts_mu: per-channel start times, as in set_timing_mu().
+        :param t_stops_mu: per-channel stop times, as in set_timing_mu().
+        """
+        for i in range(len(channels)):
+            self.set_timing_mu(channels[i], t_starts_mu[i], t_stops_mu[i])
 
+    @kernel
+    def _write_timing_mu(self, channel, t_start_mu, t_stop_mu):
         t_start_mu += 1
         t_stop_mu += 1
 
@@ -162,7 +274,7 @@ class Entangler:
 
         If the herald module does not signal success by this time the loop
         repeats. Resolution is coarse_ref_period."""
-        t_cycle_mu = t_cycle_mu >> 3
+        t_cycle_mu = t_cycle_mu >> self._coarse_shift
         self.write(ADDR_W_TCYCLE, t_cycle_mu)
 
     @kernel
@@ -173,6 +285,24 @@ class Entangler:
         t_cycle_mu = np.int32(self.core.seconds_to_mu(t_cycle))
         self.set_cycle_length_mu(t_cycle_mu)
 
+    @kernel
+    def configure_all_mu(self, enable, standalone, t_cycle_mu, channels,
+                         t_starts_mu, t_stops_mu):
+        """Configure the core, cycle length and channel timings in one go.
+
+        Equivalent to set_config() followed by set_cycle_length_mu() and
+        set_timing_mu() for each of the given channels, but issued from a
+        single kernel body, so a full initialization is one method invocation
+        with the writes emitted back-to-back.
+
+        :param channels: list of timing channel addresses.
+        :param t_starts_mu: per-channel start times, as in set_timing_mu().
+        :param t_stops_mu: per-channel stop times, as in set_timing_mu().
+        """
+        self.set_config(enable, standalone)
+        self.set_cycle_length_mu(t_cycle_mu)
+        self.set_timing_bulk_mu(channels, t_starts_mu, t_stops_mu)
+
     @kernel
     def set_heralds(self, heralds):
         """Set the count patterns that cause the entangler loop to exit
@@ -196,8 +326,26 @@ class Entangler:
         reason is 0x3fff if there was a timeout, or a bitfield giving the
         herald matches if there was a success.
         """
-        duration_mu = duration_mu >> 3
+        self.launch_mu(duration_mu)
+        return self.get_run_result()
+
+    @kernel
+    def launch_mu(self, duration_mu):
+        """Start the entanglement sequence without waiting for it to finish.
+
+        Non-blocking half of run_mu(): the caller can overlap other kernel
+        work with the running sequence and collect the outcome with
+        get_run_result().
+        """
+        duration_mu = duration_mu >> self._coarse_shift
         self.write(ADDR_W_RUN, duration_mu)
+
+    @kernel
+    def get_run_result(self):
+        """Block until the sequence started by launch_mu() has finished.
+
+        Returns the same [timestamp, reason] pair as run_mu().
+        """
         return rtio_input_timestamped_data(np.int64(-1), self.channel)
 
     @kernel
@@ -257,6 +405,22 @@ class Entangler:
         assert 0 <= idx < 4, "Pattern counter index needs to be in 0..4"
         return self.read(ADDR_R_COUNTER_RESULT_BASE + 4 + idx)
 
+    @kernel
+    def get_all_counts(self, results):
+        """Read all eight event counters with one request burst.
+
+        Fills the caller-provided eight-element list with the four gated
+        input counts followed by the four pattern counts, batching the
+        requests as in read_many() instead of paying a round-trip per
+        counter.
+        """
+        for i in range(8):
+            rtio_output(self._channel_base | (ADDR_R_COUNTER_RESULT_BASE + i),
+                        0)
+            delay_mu(self.ref_period_mu)
+        for i in range(8):
+            results[i] = rtio_input_data(self.channel)
+
     @kernel
     def set_counter_patterns(self, idx, patterns):
         """Configure the patterns matched by the given pattern counter."""
@@ -267,12 +431,5 @@ class Entangler:
         assert len(
             patterns) <= 4, "At most four patterns are supported per counter"
 
-        # Fill leftover slots with first element to effectively ignore them.
-        full_patterns = [0] * 4
-        for i in range(len(patterns)):
-            full_patterns[i] = patterns[i]
-        for i in range(len(patterns), len(full_patterns)):
-            full_patterns[i] = patterns[0]
-
         return self.write(ADDR_W_COUNTER_PATTERN_BASE + idx,
-                          patterns_to_reg(full_patterns))
+                          _encode_counter_patterns(patterns))
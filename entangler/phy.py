@@ -35,22 +35,12 @@ class Entangler(Module):
             event_counter_width, simulate=simulate))
 
         read_en = self.rtlink.o.address[5]
-        write_timings = Signal()
-        write_patterns = Signal()
-        self.comb += [
-            self.rtlink.o.busy.eq(0),
-            write_timings.eq(self.rtlink.o.address[3:6] == 1),
-            write_patterns.eq(self.rtlink.o.address[3:6] == 2),
-        ]
+        self.comb += self.rtlink.o.busy.eq(0)
 
         output_t_starts = [seq.m_start for seq in self.core.sequencers]
         output_t_ends = [seq.m_stop for seq in self.core.sequencers]
         output_t_starts += [gater.gate_start for gater in self.core.apd_gaters]
         output_t_ends += [gater.gate_stop for gater in self.core.apd_gaters]
-        write_timing_cases = {}
-        for i in range(len(output_t_starts)):
-            write_timing_cases[i] = [output_t_starts[i].eq(self.rtlink.o.data[:16]),
-                        output_t_ends[i].eq(self.rtlink.o.data[16:])]
 
         # Write timeout counter and start core running
         self.comb += [
@@ -58,33 +48,48 @@ class Entangler(Module):
             self.core.msm.run_stb.eq( (self.rtlink.o.address==1) & self.rtlink.o.stb )
         ]
 
-        self.sync.rio += [
-            If(write_timings & self.rtlink.o.stb,
-               Case(self.rtlink.o.address[:3], write_timing_cases)
-            ),
-            If(write_patterns & self.rtlink.o.stb,
-                Cat(
-                    *Array(p.patterns for p in self.core.pattern_counters)[
-                        self.rtlink.o.address[:3]]).eq(self.rtlink.o.data)
-            ),
-            If((self.rtlink.o.address == 0) & self.rtlink.o.stb,
-                # Write config
-                self.core.enable.eq(self.rtlink.o.data[0]),
-                self.core.msm.standalone.eq(self.rtlink.o.data[2]),
-            ),
-            If((self.rtlink.o.address == 2) & self.rtlink.o.stb,
-                # Write cycle length
-                self.core.msm.m_end.eq(self.rtlink.o.data[:10])
-            ),
-            If((self.rtlink.o.address == 3) & self.rtlink.o.stb,
-                # Write herald patterns and enables
-                *[
-                    self.core.heralder.patterns[i].eq(
-                        self.rtlink.o.data[4 * i:4 * (i + 1)]) for i in range(4)
+        # Single nested decode for all register writes: one Case on the write
+        # class (address[3:6]) with the low address bits resolved inside each
+        # arm, instead of a flat chain of per-address equality comparators all
+        # re-decoding the same bus.
+        self.sync.rio += If(self.rtlink.o.stb,
+            Case(self.rtlink.o.address[3:6], {
+                0: Case(self.rtlink.o.address[:3], {
+                    0: [
+                        # Write config
+                        self.core.enable.eq(self.rtlink.o.data[0]),
+                        self.core.msm.standalone.eq(self.rtlink.o.data[2]),
+                    ],
+                    2: [
+                        # Write cycle length
+                        self.core.msm.m_end.eq(self.rtlink.o.data[:10])
+                    ],
+                    3: [
+                        # Write herald patterns and enables as one wide
+                        # assignment, giving a single write enable for all
+                        # sixteen pattern bits.
+                        Cat(*self.core.heralder.patterns).eq(
+                            self.rtlink.o.data[:16]),
+                        self.core.heralder.pattern_ens.eq(
+                            self.rtlink.o.data[16:20])
+                    ],
+                }),
+                1: [
+                    # Indexed register writes; Migen lowers the Array LHS to
+                    # a decoded write enable per start/stop register instead
+                    # of a priority ladder.
+                    Array(output_t_starts)[self.rtlink.o.address[:3]].eq(
+                        self.rtlink.o.data[:16]),
+                    Array(output_t_ends)[self.rtlink.o.address[:3]].eq(
+                        self.rtlink.o.data[16:])
                 ],
-                self.core.heralder.pattern_ens.eq(self.rtlink.o.data[16:20])
-            ),
-        ]
+                2: [
+                    Cat(
+                        *Array(p.patterns for p in self.core.pattern_counters)[
+                            self.rtlink.o.address[:3]]).eq(self.rtlink.o.data)
+                ],
+            })
+        )
 
         # Write is_master bit in rio_phy reset domain to not break 422ps trigger
         # forwarding on core.reset().
@@ -98,14 +103,12 @@ class Entangler(Module):
         read_timestamps = Signal()
         read_addr = Signal(3)
 
-        # Input timestamps are [apd0, apd1, apd2, apd3, ref]
+        # Input timestamps are [apd0, apd1, apd2, apd3, ref], selected with a
+        # balanced indexed mux rather than a Case priority chain.
         input_timestamps = [gater.sig_ts for gater in self.core.apd_gaters]
         input_timestamps.append(self.core.apd_gaters[0].ref_ts)
-        cases = {}
         timing_data = Signal(14)
-        for i, ts in enumerate(input_timestamps):
-            cases[i] = [timing_data.eq(ts)]
-        self.comb += Case(read_addr, cases)
+        self.comb += timing_data.eq(Array(input_timestamps)[read_addr])
 
 
         self.sync.rio += [
@@ -125,18 +128,19 @@ class Entangler(Module):
                                    self.core.msm.success,
                                    self.core.msm.timeout))
 
+        # Indexed select instead of a Case dict: Array lowers to one balanced
+        # mux over the four registers (only the two address bits that
+        # distinguish them are used).
         reg_data = Signal(event_counter_width)
-        cases = {}
-        cases[0] = [reg_data.eq(status)]
-        cases[1] = [reg_data.eq(self.core.msm.cycles_completed)]
-        cases[2] = [reg_data.eq(self.core.msm.time_remaining)]
-        cases[3] = [reg_data.eq(self.core.triggers_received)]
-        self.comb += Case(read_addr, cases)
+        self.comb += reg_data.eq(Array([status,
+                                        self.core.msm.cycles_completed,
+                                        self.core.msm.time_remaining,
+                                        self.core.triggers_received])
+                                 [read_addr[:2]])
 
         counter_data = Signal(event_counter_width)
-        self.comb += Case(read_addr,
-            {i: [counter_data.eq(c.counter)]
-             for i, c in enumerate(self.core.counters)})
+        self.comb += counter_data.eq(
+            Array([c.counter for c in self.core.counters])[read_addr])
 
         # Generate an input event if we have a read request RTIO Output event, or if the
         # core has finished. If the core is finished output the herald match, or 0x3fff
@@ -144,15 +148,26 @@ class Entangler(Module):
         #
         # Simultaneous read requests and core-done events are not currently handled, but
         # are easy to avoid in the client code.
+        # Flat select over the three read classes (mutually exclusive address
+        # decodes; counters keep priority on the impossible both-set index,
+        # matching the previous mux chain).
+        read_data = Signal(event_counter_width)
+        self.comb += read_data.eq(
+            Array([reg_data, timing_data, counter_data, counter_data])
+            [Cat(read_timestamps, read_counters)])
+
+        # The done-event qualifier and its data are computed once and shared
+        # between i.stb and the i.data mux instead of duplicating the AND in
+        # both cones.
+        done_ev = Signal()
+        done_data = Signal(event_counter_width)
         self.comb += [
-            self.rtlink.i.stb.eq(read | self.core.enable & self.core.msm.done_stb),
-            self.rtlink.i.data.eq(
-                Mux(self.core.enable & self.core.msm.done_stb,
-                    Mux(self.core.msm.success, self.core.heralder.matches, 0x3fff),
-                    Mux(read_counters,
-                        counter_data,
-                        Mux(read_timestamps, timing_data, reg_data)
-                    )
-                )
-            )
+            done_ev.eq(self.core.enable & self.core.msm.done_stb),
+            # On timeout the reply is all-ones, so the mux reduces to OR-ing
+            # the match bits with a replicated ~success.
+            done_data.eq(self.core.heralder.matches
+                         | Replicate(~self.core.msm.success,
+                                     event_counter_width)),
+            self.rtlink.i.stb.eq(read | done_ev),
+            self.rtlink.i.data.eq(Mux(done_ev, done_data, read_data))
         ]
@@ -0,0 +1,33 @@
+"""Helpers shared between the simulation test scripts."""
+
+import os
+
+from migen import *
+
+
+def vcd_args(name):
+    # Writing VCD traces dominates simulation wall time; only dump when
+    # explicitly requested.
+    return {"vcd_name": name} if os.getenv("ENTANGLER_VCD") else {}
+
+
+class MockPhy(Module):
+    """Stand-in for a serdes input phy: pulses stb_rising with the configured
+    fine timestamp when the coarse counter reaches t_event."""
+    def __init__(self, counter):
+        self.fine_ts = Signal(3)
+        self.stb_rising = Signal()
+        # 14 bits comfortably covers the test timescales, including the
+        # out-of-cycle sentinel value of 10000.
+        self.t_event = Signal(14)
+
+        # # #
+
+        # One assignment per output (instead of defaults overridden inside an
+        # If) keeps the simulator events per mock phy to a minimum while
+        # still registering the outputs like the real serdes phy.
+        match = counter == self.t_event[3:]
+        self.sync += [
+            self.stb_rising.eq(match),
+            self.fine_ts.eq(Mux(match, self.t_event[:3], 0))
+        ]
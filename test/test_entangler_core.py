@@ -1,27 +1,13 @@
 from migen import *
 from entangler.core import *
 
-
-class MockPhy(Module):
-    def __init__(self, counter):
-        self.fine_ts = Signal(3)
-        self.stb_rising = Signal()
-        self.t_event = Signal(32)
-
-        # # #
-        self.sync += [
-            self.stb_rising.eq(0),
-            self.fine_ts.eq(0),
-            If(counter==self.t_event[3:],
-                self.stb_rising.eq(1),
-                self.fine_ts.eq(self.t_event[:3])
-            )
-        ]
+from _sim_common import MockPhy, vcd_args
 
 
 class StandaloneHarness(Module):
     def __init__(self):
-        self.counter = Signal(32)
+        # Mirrors msm.m, which is 10 bits wide.
+        self.counter = Signal(10)
 
         self.submodules.phy_apd0 = MockPhy(self.counter)
         self.submodules.phy_apd1 = MockPhy(self.counter)
@@ -42,7 +28,7 @@ def standalone_test(dut):
     yield dut.core.msm.m_end.eq(20)
     yield dut.core.msm.is_master.eq(1)
     yield dut.core.msm.standalone.eq(1)
-    yield dut.core.msm.time_remaining.eq(100)
+    yield dut.core.msm.time_remaining_buf.eq(100)
 
     yield dut.core.sequencers[0].m_start.eq(1)
     yield dut.core.sequencers[0].m_stop.eq(9)
@@ -74,6 +60,15 @@ def standalone_test(dut):
     yield dut.core.msm.run_stb.eq(0)
 
     for i in range(50):
+        # Sequencer 0 (m_start=1, m_stop=9) must assert the cycle after the
+        # start comparator fires and deassert the cycle after the stop
+        # comparator fires, i.e. exactly for m in [2, 9]. m is held at 0
+        # outside the counter state, where the output must stay low - in
+        # particular it must not pre-arm during the trigger states even with
+        # the minimum m_start of 1.
+        m = yield dut.core.msm.m
+        output = yield dut.core.sequencers[0].output
+        assert output == (2 <= m <= 9)
         yield
 
     yield dut.phy_ref.t_event.eq( 8*10+3 )
@@ -87,4 +82,4 @@ def standalone_test(dut):
 
 if __name__ == "__main__":
     dut = StandaloneHarness()
-    run_simulation(dut, standalone_test(dut), vcd_name="core_standalone.vcd",  clocks={"sys": 8})
+    run_simulation(dut, standalone_test(dut), **vcd_args("core_standalone.vcd"), clocks={"sys": 8})
@@ -1,21 +1,12 @@
+import logging
+import os
+
 from migen import *
 from entangler.core import *
 
-class MockPhy(Module):
-    def __init__(self, counter):
-        self.fine_ts = Signal(3)
-        self.stb_rising = Signal()
-        self.t_event = Signal(32)
+from _sim_common import MockPhy, vcd_args
 
-        # # #
-        self.sync += [
-            self.stb_rising.eq(0),
-            self.fine_ts.eq(0),
-            If(counter==self.t_event[3:],
-                self.stb_rising.eq(1),
-                self.fine_ts.eq(self.t_event[:3])
-            )
-        ]
+logger = logging.getLogger(__name__)
 
 
 class GaterHarness(Module):
@@ -55,29 +46,37 @@ def gater_test(dut, gate_start=None, gate_stop=None, t_ref=None, t_sig=None):
     ref_ts = (yield dut.core.ref_ts)
     sig_ts = (yield dut.core.sig_ts)
 
-    print(triggered, ref_ts, sig_ts)
+    logger.debug("triggered=%d ref_ts=%d sig_ts=%d", triggered, ref_ts, sig_ts)
 
     dt = t_sig-t_ref
     expected_triggered = (dt >= gate_start) & (dt <= gate_stop)
     assert(triggered==expected_triggered)
 
 
-if __name__ == "__main__":
-    dut = GaterHarness()
-    run_simulation(dut, gater_test(dut, 20,30,20,41), vcd_name="gater.vcd")
+def gater_tests(dut):
+    # All cases share one harness and simulation; gater_test pulses dut.rst
+    # before each run, which resets m and clears the gater state, so the
+    # cases remain independent without re-elaborating the design.
+    yield from gater_test(dut, 20, 30, 20, 41)
 
     gate_start=8
     gate_stop=25
     t_ref=20
 
-    dut = GaterHarness()
-    run_simulation(dut, gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_start-1))
-    
-    dut = GaterHarness()
-    run_simulation(dut, gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_start))
+    yield from gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_start-1)
+    yield from gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_start)
+    yield from gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_stop)
+    yield from gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_stop+1)
 
-    dut = GaterHarness()
-    run_simulation(dut, gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_stop))
+    # Sweep the signal time across (and a little beyond) the whole window;
+    # sharing one elaboration keeps this cheap. gater_test checks each case
+    # against the same window oracle.
+    for t_sig in range(t_ref - 5, t_ref + gate_stop + 6):
+        yield from gater_test(dut, gate_start, gate_stop, t_ref, t_sig)
 
+
+if __name__ == "__main__":
+    if os.getenv("ENTANGLER_DEBUG"):
+        logging.basicConfig(level=logging.DEBUG)
     dut = GaterHarness()
-    run_simulation(dut, gater_test(dut, gate_start, gate_stop, t_ref, t_ref+gate_stop+1))
\ No newline at end of file
+    run_simulation(dut, gater_tests(dut), **vcd_args("gater.vcd"))
\ No newline at end of file
@@ -1,9 +1,19 @@
 from migen import *
 from entangler.core import *
 
+from _sim_common import vcd_args
+
 patterns = [0b1001, 0b0110, 0b1010, 0b0101]
 n_sig = 4
 
+# Precomputed oracle, indexed [pattern_ens][sig], so the hot assertion loop
+# does a table lookup instead of rebuilding a list per cycle.
+expected_herald = [
+    [any(p == i and (j & 2**n) for n, p in enumerate(patterns))
+     for i in range(2**n_sig)]
+    for j in range(2**len(patterns))
+]
+
 def heralder_test(dut):
     for i,p in enumerate(patterns):
         yield dut.patterns[i].eq(p)
@@ -15,8 +25,8 @@ def heralder_test(dut):
         for i in range(2**n_sig):
             yield dut.sig.eq(i)
             yield
-            assert (yield dut.herald) == any([p==i and (j & 2**n) for n,p in enumerate(patterns)])
+            assert (yield dut.herald) == expected_herald[j][i]
 
 if __name__ == "__main__":
     dut = Heralder(n_sig=n_sig, n_patterns=len(patterns))
-    run_simulation(dut, heralder_test(dut), vcd_name="heralder.vcd")
\ No newline at end of file
+    run_simulation(dut, heralder_test(dut), **vcd_args("heralder.vcd"))
\ No newline at end of file
@@ -1,26 +1,30 @@
 from migen import *
 from entangler.core import *
 
+from _sim_common import vcd_args
+
+
+
+def setup_msm(dut, m_end=10, time_remaining=100, is_master=1):
+    yield dut.m_end.eq(m_end)
+    yield dut.is_master.eq(is_master)
+    yield dut.time_remaining_buf.eq(time_remaining)
 
 
 def msm_master_test(dut):
-    yield dut.m_end.eq(10)
-    yield dut.is_master.eq(1)
-    yield dut.time_remaining.eq(100)
+    yield from setup_msm(dut)
 
     for i in range(30):
         if i == 5:
-            yield dut.slave_ready.eq(1)
+            yield dut.slave_ready_raw.eq(1)
         yield
 
 def msm_slave_test(dut):
-    yield dut.m_end.eq(10)
-    yield dut.is_master.eq(1)
-    yield dut.cycles_remaining.eq(3)
+    yield from setup_msm(dut, is_master=0)
 
     for i in range(30):
         if i == 5:
-            yield dut.slave_ready.eq(1)
+            yield dut.slave_ready_raw.eq(1)
         yield
 
 
@@ -37,12 +41,68 @@ class MsmPair(Module):
             self.slave.timeout_in_raw.eq(self.master.timeout)
         ]
 
+        # Monitoring latches so the test can advance the clock freely and
+        # inspect the outcome once per run instead of sampling done_stb,
+        # success and m from Python on every cycle. done_clear re-arms the
+        # latches and zeroes the cycle counter at the start of a run.
+        self.tick = Signal(16)
+        self.done_clear = Signal()
+        self.master_done = Signal()
+        self.slave_done = Signal()
+        self.t_master_done = Signal(16)
+        self.t_slave_done = Signal(16)
+        self.success_master = Signal()
+        self.success_slave = Signal()
+        self.align_err = Signal()
+        self.sync += [
+            self.tick.eq(self.tick + 1),
+            If(self.done_clear,
+                self.tick.eq(0),
+                self.master_done.eq(0),
+                self.slave_done.eq(0),
+                self.align_err.eq(0)
+            ).Else(
+                If(self.master.done_stb & ~self.master_done,
+                    self.master_done.eq(1),
+                    self.t_master_done.eq(self.tick),
+                    self.success_master.eq(self.master.success)
+                ),
+                If(self.slave.done_stb & ~self.slave_done,
+                    self.slave_done.eq(1),
+                    self.t_slave_done.eq(self.tick),
+                    self.success_slave.eq(self.slave.success)
+                ),
+                If((self.master.m == 1) & (self.slave.m != 1),
+                    self.align_err.eq(1)
+                )
+            )
+        ]
+
+
+class MsmHarness(Module):
+    """Pair and standalone state machines in one design, so both tests can
+    share a single elaboration and simulation."""
+    def __init__(self):
+        self.submodules.pair = MsmPair()
+        self.submodules.standalone = MainStateMachine()
+
+        # Sticky done flag for the standalone machine, so its test does not
+        # have to sample the single-cycle done_stb on every clock.
+        self.standalone_done = Signal()
+        self.standalone_done_clear = Signal()
+        self.sync += If(self.standalone_done_clear,
+                self.standalone_done.eq(0)
+            ).Elif(self.standalone.done_stb,
+                self.standalone_done.eq(1)
+            )
+
 
 def msm_standalone_test(dut):
-    yield dut.m_end.eq(10)
-    yield dut.is_master.eq(1)
-    yield dut.standalone.eq(1)
-    yield dut.time_remaining_buf.eq(80)
+    msm = dut.standalone
+    yield msm.m_end.eq(10)
+    yield msm.is_master.eq(1)
+    yield msm.standalone.eq(1)
+    yield msm.time_remaining_buf.eq(80)
 
     yield
     yield
@@ -52,19 +112,21 @@ def msm_standalone_test(dut):
         # that we time out
         for _ in range(20):
             yield
-        yield dut.run_stb.eq(1)
+        yield dut.standalone_done_clear.eq(1)
         yield
-        yield dut.run_stb.eq(0)
-        finished = False
+        yield dut.standalone_done_clear.eq(0)
+        yield msm.run_stb.eq(1)
+        yield
+        yield msm.run_stb.eq(0)
+        # The harness done latch records completion, so this loop only
+        # drives the herald stimulus and advances the clock.
         for i in range(100):
             if i == 40 and allow_success:
-                yield dut.herald.eq(1)
-            if i>40 and (yield dut.done_stb):
-                finished = True
+                yield msm.herald.eq(1)
             yield
-        yield dut.herald.eq(0)
-        assert finished
-        success = yield dut.success
+        yield msm.herald.eq(0)
+        assert (yield dut.standalone_done)
+        success = yield msm.success
         assert success == allow_success
 
     yield from run()
@@ -85,12 +147,13 @@ def msm_pair_test(dut):
 
     def run(t_start_master=10, t_start_slave=20, t_herald=None):
         yield dut.master.herald.eq(0)
-        for _ in range(5):
+        # Re-arm the monitoring latches; dropping done_clear on the last
+        # settling cycle lines dut.tick up with the loop index below.
+        yield dut.done_clear.eq(1)
+        for _ in range(4):
             yield
-        t_master_done = None
-        success_master = False
-        success_slave = False
-        t_slave_done = None
+        yield dut.done_clear.eq(0)
+        yield
         for i in range(200):
             if i==t_start_master:
                 yield dut.master.run_stb.eq(1)
@@ -102,20 +165,15 @@ def msm_pair_test(dut):
                 yield dut.slave.run_stb.eq(0)
             if t_herald and i==t_herald:
                 yield dut.master.herald.eq(1)
-
-            if (yield dut.master.done_stb):
-                t_master_done = i
-                success_master = yield dut.master.success
-            if (yield dut.slave.done_stb):
-                t_slave_done = i
-                success_slave = yield dut.slave.success
-
-            m_master = yield dut.master.m
-            m_slave = yield dut.slave.m
-            if m_master == 1:
-                assert m_master == m_slave
-
             yield
+
+        # The MsmPair latches captured the done times, success flags and any
+        # m misalignment, so a handful of reads replaces per-cycle sampling.
+        t_master_done = (yield dut.t_master_done) if (yield dut.master_done) else None
+        t_slave_done = (yield dut.t_slave_done) if (yield dut.slave_done) else None
+        success_master = bool((yield dut.success_master)) and t_master_done is not None
+        success_slave = bool((yield dut.success_slave)) and t_slave_done is not None
+        assert not (yield dut.align_err)
         print(t_master_done, t_slave_done)
 
         # Master and slave should agree on success
@@ -144,9 +202,13 @@ def msm_pair_test(dut):
 
 
 
-if __name__ == "__main__":
-    dut = MsmPair()
-    run_simulation(dut, msm_pair_test(dut), vcd_name="msm_pair.vcd")
+def msm_tests(dut):
+    # The idle half of the harness just sits with run_stb deasserted while
+    # the other test runs, so the two tests stay independent.
+    yield from msm_pair_test(dut.pair)
+    yield from msm_standalone_test(dut)
 
-    dut = MainStateMachine()
-    run_simulation(dut, msm_standalone_test(dut), vcd_name="msm_standalone.vcd")
\ No newline at end of file
+
+if __name__ == "__main__":
+    dut = MsmHarness()
+    run_simulation(dut, msm_tests(dut), **vcd_args("msm.vcd"))
\ No newline at end of file
@@ -2,6 +2,19 @@ from migen import *
 from entangler.driver import *
 from entangler.phy import *
 
+from _sim_common import MockPhy, vcd_args
+
+
+# Register images of the test configurations, computed once at import time.
+OUTPUT_TIMING_WORDS = tuple((2 * i + 2) << 16 | (2 * i + 1) for i in range(4))
+HERALD_PATTERNS_REG = patterns_to_reg([0b0101, 0b1010, 0b1100, 0b0011])
+COUNTER_PATTERN_REGS = [
+    patterns_to_reg([0b0001] * 4),
+    patterns_to_reg([0b1001] * 4),
+    patterns_to_reg([0b1001, 0b0110] * 2),
+    patterns_to_reg([0b1100] * 4),
+]
+
 
 def rtio_output_event(rtlink, addr, data):
     yield rtlink.o.address.eq(addr)
@@ -21,28 +34,10 @@ def rtio_input(rtlink, timeout):
     return (yield rtlink.i.data)
 
 
-class MockPhy(Module):
-    def __init__(self, counter):
-        self.fine_ts = Signal(3)
-        self.stb_rising = Signal()
-        self.t_event = Signal(32)
-
-        # # #
-        self.sync += [
-            self.stb_rising.eq(0),
-            self.fine_ts.eq(0),
-            If(counter == self.t_event[3:],
-                self.stb_rising.eq(1),
-                self.fine_ts.eq(self.t_event[:3])
-            ).Else(
-                self.stb_rising.eq(0)
-            )
-        ]
-
-
 class PhyHarness(Module):
     def __init__(self):
-        self.counter = Signal(32)
+        # Mirrors msm.m, which is 10 bits wide.
+        self.counter = Signal(10)
 
         self.submodules.phy_apd0 = MockPhy(self.counter)
         self.submodules.phy_apd1 = MockPhy(self.counter)
@@ -56,14 +51,36 @@ class PhyHarness(Module):
         core_link_pads = None
         output_pads = None
         passthrough_sigs = None
-        self.submodules.core = Entangler(core_link_pads,
-                                         output_pads,
-                                         passthrough_sigs,
-                                         input_phys,
-                                         simulate=True)
+        # The tests clock all domains at the same 8 ns period, so fold the
+        # rio/rio_phy domains onto sys and let the simulator run a single
+        # clock instead of three identical ones.
+        self.submodules.core = ClockDomainsRenamer(
+            {"rio": "sys", "rio_phy": "sys"})(Entangler(core_link_pads,
+                                                        output_pads,
+                                                        passthrough_sigs,
+                                                        input_phys,
+                                                        simulate=True))
 
         self.comb += self.counter.eq(self.core.core.msm.m)
 
+        # Timeout-event latch for test_timeout: counting the 0x3fff input
+        # events and their arrival time in gateware lets the test advance in
+        # bulk instead of sampling the single-cycle input strobe from Python
+        # on every clock.
+        self.tick = Signal(32)
+        self.timeout_count = Signal(8)
+        self.timeout_cycle = Signal(32)
+        self.timeout_clear = Signal()
+        self.sync += [
+            self.tick.eq(self.tick + 1),
+            If(self.timeout_clear,
+                self.timeout_count.eq(0)
+            ).Elif(self.core.rtlink.i.stb & (self.core.rtlink.i.data == 0x3fff),
+                self.timeout_count.eq(self.timeout_count + 1),
+                If(self.timeout_count == 0, self.timeout_cycle.eq(self.tick))
+            )
+        ]
+
 
 def test_basic(dut):
     def out(addr, data):
@@ -86,9 +103,9 @@ def test_basic(dut):
     for _ in range(5):
         yield
     yield from out(ADDR_W_CONFIG, 0b110)  # disable, standalone
-    yield from out(ADDR_W_HERALD, patterns_to_reg([0b0101, 0b1010, 0b1100, 0b0011]))
-    for i in range(4):
-        yield from out(ADDR_W_TIMING_BASE + i, (2 * i + 2) * (1 << 16) | 2 * i + 1)
+    yield from out(ADDR_W_HERALD, HERALD_PATTERNS_REG)
+    for i, word in enumerate(OUTPUT_TIMING_WORDS):
+        yield from out(ADDR_W_TIMING_BASE + i, word)
     for i in [0,1]:
         yield from out(ADDR_W_TIMING_BASE + 4 + i, (30<<16) | 18)
     for i in [2,3]:
@@ -132,19 +149,26 @@ def test_patterns(dut):
     def read(timeout):
         return (yield from rtio_input(dut.core.rtlink, timeout))
 
+    def wait_cycles_completed(n, batch=4):
+        # cycles_completed is a level (not a single-cycle strobe), so the
+        # wait can advance several clocks between polls. batch=1 gives the
+        # cycle-exact exit needed when an input event must be caught
+        # immediately afterwards.
+        while (yield dut.core.core.msm.cycles_completed) < n:
+            for _ in range(batch):
+                yield
+
     for _ in range(5):
         yield
     yield from out(ADDR_W_CONFIG, 0b110)  # disable, standalone
-    yield from out(ADDR_W_HERALD, patterns_to_reg([0b0101, 0b1010, 0b1100, 0b0011]))
-    for i in range(4):
-        yield from out(ADDR_W_TIMING_BASE + i, (2 * i + 2) * (1 << 16) | 2 * i + 1)
+    yield from out(ADDR_W_HERALD, HERALD_PATTERNS_REG)
+    for i, word in enumerate(OUTPUT_TIMING_WORDS):
+        yield from out(ADDR_W_TIMING_BASE + i, word)
     for i in range(4):
         yield from out(ADDR_W_TIMING_BASE + 4 + i, (30<<16) | 18)
 
-    yield from out(ADDR_W_COUNTER_PATTERN_BASE + 0, patterns_to_reg([0b0001] * 4))
-    yield from out(ADDR_W_COUNTER_PATTERN_BASE + 1, patterns_to_reg([0b1001] * 4))
-    yield from out(ADDR_W_COUNTER_PATTERN_BASE + 2, patterns_to_reg([0b1001, 0b0110] * 2))
-    yield from out(ADDR_W_COUNTER_PATTERN_BASE + 3, patterns_to_reg([0b1100] * 4))
+    for i, reg in enumerate(COUNTER_PATTERN_REGS):
+        yield from out(ADDR_W_COUNTER_PATTERN_BASE + i, reg)
 
     yield from out(ADDR_W_TCYCLE, 1000 // 8)
 
@@ -169,36 +193,28 @@ def test_patterns(dut):
     yield dut.phy_apd1.t_event.eq(tnil)
     yield dut.phy_apd2.t_event.eq(tnil)
     yield dut.phy_apd3.t_event.eq(tnil)
-    while not (yield dut.core.core.msm.cycle_ending):
-        yield
-    yield
+    yield from wait_cycles_completed(1)
 
     yield dut.phy_ref.t_event.eq(tr)
     yield dut.phy_apd0.t_event.eq(t0)
     yield dut.phy_apd1.t_event.eq(tnil)
     yield dut.phy_apd2.t_event.eq(tnil)
     yield dut.phy_apd3.t_event.eq(t1)
-    while not (yield dut.core.core.msm.cycle_ending):
-        yield
-    yield
+    yield from wait_cycles_completed(2)
 
     yield dut.phy_ref.t_event.eq(tr)
     yield dut.phy_apd0.t_event.eq(tnil)
     yield dut.phy_apd1.t_event.eq(t0)
     yield dut.phy_apd2.t_event.eq(t1)
     yield dut.phy_apd3.t_event.eq(tnil)
-    while not (yield dut.core.core.msm.cycle_ending):
-        yield
-    yield
+    yield from wait_cycles_completed(3)
 
     yield dut.phy_ref.t_event.eq(tr)
     yield dut.phy_apd0.t_event.eq(tnil)
     yield dut.phy_apd1.t_event.eq(tnil)
     yield dut.phy_apd2.t_event.eq(t0)
     yield dut.phy_apd3.t_event.eq(t1)
-    while not (yield dut.core.core.msm.cycle_ending):
-        yield
-    yield
+    yield from wait_cycles_completed(4, batch=1)
 
     assert (yield from read(2)) == 0b0100, "Unexpected pattern"
     yield
@@ -234,20 +250,22 @@ def test_timeout(dut):
         yield from out(ADDR_W_CONFIG, 0b110)  # disable, standalone
         yield from out(ADDR_W_TCYCLE, n_cycles)
         yield from out(ADDR_W_CONFIG, 0b111)  # Enable standalone
+        yield dut.timeout_clear.eq(1)
+        yield
+        yield dut.timeout_clear.eq(0)
         yield from out(ADDR_W_RUN, timeout)
+        start = yield dut.tick
 
-        timedout = False
+        # The harness latch records the timeout events, so the generator only
+        # needs to advance the clock here rather than sample the input strobe
+        # on every cycle.
         for i in range(timeout + n_cycles + 50):
-            if (yield dut.core.rtlink.i.stb):
-                data = (yield dut.core.rtlink.i.data)
-                if data == 0x3fff:
-                    # This should be the first and only timeout
-                    assert not timedout
-                    # Timeout should happen in a timely fashion
-                    assert i <= timeout + n_cycles + 5
-                    timedout = True
             yield
-        assert timedout
+
+        # This should be the first and only timeout
+        assert (yield dut.timeout_count) == 1
+        # Timeout should happen in a timely fashion
+        assert (yield dut.timeout_cycle) - start <= timeout + n_cycles + 5
 
     for i in range(1, 20):
         yield from do_timeout(i, n_cycles=10)
@@ -257,29 +275,17 @@ if __name__ == "__main__":
     dut = PhyHarness()
     run_simulation(dut,
                    test_basic(dut),
-                   vcd_name="phy_basic.vcd",
-                   clocks={
-                       "sys": 8,
-                       "rio": 8,
-                       "rio_phy": 8
-                   })
+                   **vcd_args("phy_basic.vcd"),
+                   clocks={"sys": 8})
 
     dut = PhyHarness()
     run_simulation(dut,
                    test_patterns(dut),
-                   vcd_name="phy_patterns.vcd",
-                   clocks={
-                       "sys": 8,
-                       "rio": 8,
-                       "rio_phy": 8
-                   })
+                   **vcd_args("phy_patterns.vcd"),
+                   clocks={"sys": 8})
 
     dut = PhyHarness()
     run_simulation(dut,
                    test_timeout(dut),
-                   vcd_name="phy_timeout.vcd",
-                   clocks={
-                       "sys": 8,
-                       "rio": 8,
-                       "rio_phy": 8
-                   })
+                   **vcd_args("phy_timeout.vcd"),
+                   clocks={"sys": 8})
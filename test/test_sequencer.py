@@ -1,13 +1,38 @@
 from migen import *
 from entangler.core import *
 
+from _sim_common import vcd_args
+
+
 class ChannelSequencerHarness(Module):
     def __init__(self):
         self.m = Signal(10)
         self.submodules.core = ChannelSequencer(self.m)
 
+def check_start(dut):
+    assert (yield dut.core.stb_start) == 1
+    assert (yield dut.core.output) == 0
+
+def check_output_high(dut):
+    assert (yield dut.core.output) == 1
+
+def check_stop(dut):
+    assert (yield dut.core.stb_stop) == 1
+    assert (yield dut.core.output) == 1
+
+def check_output_low(dut):
+    assert (yield dut.core.output) == 0
+
+# Cycle-indexed checks, so the drive loop does one dict lookup per cycle
+# instead of re-testing every interesting cycle number.
+CHECKS = {
+    10: check_start,
+    11: check_output_high,
+    30: check_stop,
+    31: check_output_low,
+}
+
 def channel_sequencer_test(dut):
-    m = Signal(10)
     yield dut.core.clear.eq(1)
     yield dut.core.m_start.eq(10)
     yield dut.core.m_stop.eq(30)
@@ -18,17 +43,10 @@ def channel_sequencer_test(dut):
         yield dut.m.eq(i)
         yield
 
-        if i==10:
-            assert (yield dut.core.stb_start) == 1
-            assert (yield dut.core.output) == 0
-        if i==11:
-            assert (yield dut.core.output) == 1
-        if i==30:
-            assert (yield dut.core.stb_stop) == 1
-            assert (yield dut.core.output) == 1
-        if i==31:
-            assert (yield dut.core.output) == 0
+        check = CHECKS.get(i)
+        if check is not None:
+            yield from check(dut)
 
 if __name__ == "__main__":
     dut = ChannelSequencerHarness()
-    run_simulation(dut, channel_sequencer_test(dut), vcd_name="sequencer.vcd")
\ No newline at end of file
+    run_simulation(dut, channel_sequencer_test(dut), **vcd_args("sequencer.vcd"))
\ No newline at end of file
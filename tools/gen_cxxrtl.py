@@ -0,0 +1,79 @@
+"""Generate a fast host-side simulation model of EntanglerCore via cxxrtl.
+
+Converts the core to Verilog with Migen and, if yosys is available, runs the
+Yosys cxxrtl backend on the result. The generated C++ model simulates orders
+of magnitude faster than event-driven HDL simulation, which makes brute-force
+scans over herald patterns or gate windows practical for logic iteration.
+
+Usage:
+    python tools/gen_cxxrtl.py [output-dir]
+
+Only `prep` is run in yosys before write_cxxrtl; the heavier optimisation
+passes tend to make the generated model slower, not faster.
+"""
+
+import os
+import subprocess
+import sys
+
+from migen import *
+from migen.fhdl import verilog
+
+from entangler.core import EntanglerCore
+
+
+class _StubPhy(Module):
+    """Input phy stand-in with the interface the gaters expect."""
+    def __init__(self):
+        self.fine_ts = Signal(3)
+        self.stb_rising = Signal()
+
+
+def main():
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "build"
+    os.makedirs(output_dir, exist_ok=True)
+
+    phys = [_StubPhy() for _ in range(5)]
+    core = EntanglerCore(None, None, None, phys, simulate=True)
+    for phy in phys:
+        core.submodules += phy
+
+    ios = {core.enable, core.msm.run_stb, core.msm.done_stb, core.msm.ready,
+           core.msm.success, core.msm.timeout, core.msm.m_end,
+           core.msm.time_remaining_buf, core.msm.is_master,
+           core.msm.standalone, core.heralder.pattern_ens,
+           core.heralder.matches}
+    ios |= set(core.heralder.patterns)
+    # The timing configuration registers and per-channel results, so gate
+    # windows and output timings can actually be driven (and observed) from
+    # the generated model.
+    for gater in core.apd_gaters:
+        ios |= {gater.gate_start, gater.gate_stop, gater.triggered,
+                gater.ref_ts, gater.sig_ts}
+    for sequencer in core.sequencers:
+        ios |= {sequencer.m_start, sequencer.m_stop, sequencer.output}
+    for pattern_counter in core.pattern_counters:
+        ios |= set(pattern_counter.patterns)
+    ios |= {counter.counter for counter in core.counters}
+    for phy in phys:
+        ios |= {phy.fine_ts, phy.stb_rising}
+
+    verilog_path = os.path.join(output_dir, "entangler_core.v")
+    with open(verilog_path, "w") as f:
+        f.write(str(verilog.convert(core, ios=ios, name="entangler_core")))
+    print("Wrote", verilog_path)
+
+    cxxrtl_path = os.path.join(output_dir, "entangler_core.cc")
+    try:
+        subprocess.check_call([
+            "yosys", "-q", "-p",
+            "read_verilog {}; prep -top entangler_core; write_cxxrtl {}".format(
+                verilog_path, cxxrtl_path)])
+    except FileNotFoundError:
+        print("yosys not found; skipping cxxrtl generation")
+        return
+    print("Wrote", cxxrtl_path)
+
+
+if __name__ == "__main__":
+    main()